@@ -11,110 +11,201 @@ Flash to the hub MicroBit (connect to laptop via USB)
 
 from microbit import *
 import radio
+import struct
 
 # ============== INLINED KITRONIK OLED DRIVER ==============
-OLED_FONT = [
- 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422,
- 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422,
- 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422,
- 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422, 0x0022d422,
- 0x00000000, 0x000002e0, 0x00018060, 0x00afabea, 0x00aed6ea, 0x01991133, 0x010556aa, 0x00000060,
- 0x000045c0, 0x00003a20, 0x00051140, 0x00023880, 0x00002200, 0x00021080, 0x00000100, 0x00111110,
- 0x0007462e, 0x00087e40, 0x000956b9, 0x0005d629, 0x008fa54c, 0x009ad6b7, 0x008ada88, 0x00119531,
- 0x00aad6aa, 0x0022b6a2, 0x00000140, 0x00002a00, 0x0008a880, 0x00052940, 0x00022a20, 0x0022d422,
- 0x00e4d62e, 0x000f14be, 0x000556bf, 0x0008c62e, 0x0007463f, 0x0008d6bf, 0x000094bf, 0x00cac62e,
- 0x000f909f, 0x000047f1, 0x0017c629, 0x0008a89f, 0x0008421f, 0x01f1105f, 0x01f4105f, 0x0007462e,
- 0x000114bf, 0x000b6526, 0x010514bf, 0x0004d6b2, 0x0010fc21, 0x0007c20f, 0x00744107, 0x01f4111f,
- 0x000d909b, 0x00117041, 0x0008ceb9, 0x0008c7e0, 0x01041041, 0x000fc620, 0x00010440, 0x01084210,
- 0x00000820, 0x010f4a4c, 0x0004529f, 0x00094a4c, 0x000fd288, 0x000956ae, 0x000097c4, 0x0007d6a2,
- 0x000c109f, 0x000003a0, 0x0006c200, 0x0008289f, 0x000841e0, 0x01e1105e, 0x000e085e, 0x00064a4c,
- 0x0002295e, 0x000f2944, 0x0001085c, 0x00012a90, 0x010a51e0, 0x010f420e, 0x00644106, 0x01e8221e,
- 0x00093192, 0x00222292, 0x00095b52, 0x0008fc80, 0x000003e0, 0x000013f1, 0x00841080, 0x0022d422
-]
+# Kitronik 5x5 font, pre-rotated into SSD1306 column order: 5 bytes per
+# ASCII character 0-127, each byte one column with bit 1 at the top row
+OLED_GLYPHS = (
+    b"\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04"  # 0x00-0x03
+    b"\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04"  # 0x04-0x07
+    b"\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04"  # 0x08-0x0b
+    b"\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04"  # 0x0c-0x0f
+    b"\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04"  # 0x10-0x13
+    b"\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04"  # 0x14-0x17
+    b"\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04"  # 0x18-0x1b
+    b"\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04\x04\x02\x2a\x0a\x04"  # 0x1c-0x1f
+    b"\x00\x00\x00\x00\x00\x00\x2e\x00\x00\x00\x00\x06\x00\x06\x00\x14\x3e\x14\x3e\x14"  # 0x20-0x23
+    b"\x14\x2e\x2a\x3a\x14\x26\x12\x08\x24\x32\x14\x2a\x2a\x14\x20\x00\x06\x00\x00\x00"  # 0x24-0x27
+    b"\x00\x1c\x22\x00\x00\x00\x22\x1c\x00\x00\x00\x14\x08\x14\x00\x00\x08\x1c\x08\x00"  # 0x28-0x2b
+    b"\x00\x20\x10\x00\x00\x00\x08\x08\x08\x00\x00\x10\x00\x00\x00\x20\x10\x08\x04\x02"  # 0x2c-0x2f
+    b"\x1c\x22\x22\x1c\x00\x00\x24\x3e\x20\x00\x32\x2a\x2a\x24\x00\x12\x22\x2a\x16\x00"  # 0x30-0x33
+    b"\x18\x14\x12\x3e\x10\x2e\x2a\x2a\x2a\x12\x10\x28\x2c\x2a\x10\x22\x12\x0a\x06\x02"  # 0x34-0x37
+    b"\x14\x2a\x2a\x2a\x14\x04\x2a\x1a\x0a\x04\x00\x14\x00\x00\x00\x00\x20\x14\x00\x00"  # 0x38-0x3b
+    b"\x00\x08\x14\x22\x00\x00\x14\x14\x14\x00\x00\x22\x14\x08\x00\x04\x02\x2a\x0a\x04"  # 0x3c-0x3f
+    b"\x1c\x22\x2a\x12\x1c\x3c\x0a\x0a\x3c\x00\x3e\x2a\x2a\x14\x00\x1c\x22\x22\x22\x00"  # 0x40-0x43
+    b"\x3e\x22\x22\x1c\x00\x3e\x2a\x2a\x22\x00\x3e\x0a\x0a\x02\x00\x1c\x22\x22\x2a\x18"  # 0x44-0x47
+    b"\x3e\x08\x08\x3e\x00\x22\x3e\x22\x00\x00\x12\x22\x22\x1e\x02\x3e\x08\x14\x22\x00"  # 0x48-0x4b
+    b"\x3e\x20\x20\x20\x00\x3e\x04\x08\x04\x3e\x3e\x04\x08\x10\x3e\x1c\x22\x22\x1c\x00"  # 0x4c-0x4f
+    b"\x3e\x0a\x0a\x04\x00\x0c\x12\x32\x2c\x00\x3e\x0a\x0a\x14\x20\x24\x2a\x2a\x12\x00"  # 0x50-0x53
+    b"\x02\x02\x3e\x02\x02\x1e\x20\x20\x1e\x00\x0e\x10\x20\x10\x0e\x3e\x10\x08\x10\x3e"  # 0x54-0x57
+    b"\x36\x08\x08\x36\x00\x02\x04\x38\x04\x02\x32\x2a\x26\x22\x00\x00\x3e\x22\x22\x00"  # 0x58-0x5b
+    b"\x02\x04\x08\x10\x20\x00\x22\x22\x3e\x00\x00\x04\x02\x04\x00\x20\x20\x20\x20\x20"  # 0x5c-0x5f
+    b"\x00\x02\x04\x00\x00\x18\x24\x24\x3c\x20\x3e\x28\x28\x10\x00\x18\x24\x24\x24\x00"  # 0x60-0x63
+    b"\x10\x28\x28\x3e\x00\x1c\x2a\x2a\x24\x00\x08\x3c\x0a\x02\x00\x04\x2a\x2a\x1e\x00"  # 0x64-0x67
+    b"\x3e\x08\x08\x30\x00\x00\x3a\x00\x00\x00\x00\x20\x20\x1a\x00\x3e\x08\x14\x20\x00"  # 0x68-0x6b
+    b"\x00\x1e\x20\x20\x00\x3c\x04\x08\x04\x3c\x3c\x04\x04\x38\x00\x18\x24\x24\x18\x00"  # 0x6c-0x6f
+    b"\x3c\x14\x14\x08\x00\x08\x14\x14\x3c\x00\x38\x04\x04\x04\x00\x20\x28\x14\x04\x00"  # 0x70-0x73
+    b"\x00\x1e\x28\x28\x20\x1c\x20\x20\x3c\x20\x0c\x10\x20\x10\x0c\x3c\x20\x10\x20\x3c"  # 0x74-0x77
+    b"\x24\x18\x18\x24\x00\x24\x28\x10\x08\x04\x24\x34\x2c\x24\x00\x00\x08\x3e\x22\x00"  # 0x78-0x7b
+    b"\x00\x3e\x00\x00\x00\x22\x3e\x08\x00\x00\x00\x08\x08\x10\x10\x04\x02\x2a\x0a\x04"  # 0x7c-0x7f
+)
+# Slicing a memoryview copies glyph bytes without a temporary bytes object
+_GLYPH_VIEW = memoryview(OLED_GLYPHS)
 
 _oled_initialised = False
 oled_present = False
 
-def _oled_i2c_write_cmd(cmd):
-    i2c.write(0x3C, bytearray([0, cmd]))
+# Page buffer reused by oled_show: data control byte followed by 128 columns
+_PAGE_BUF = bytearray(129)
+_PAGE_BUF[0] = 0x40
+_BLANK_COLS = bytes(128)
+# Full-screen column (0-127) and page (0-7) window for horizontal addressing
+_OLED_FULL_WINDOW = bytes([0x00, 0x21, 0, 127, 0x22, 0, 7])
 
-def _oled_i2c_write_data(data):
-    i2c.write(0x3C, bytearray([0x40]) + data)
+def _oled_i2c_write_page(buf):
+    """Write a page buffer that already starts with the 0x40 control byte"""
+    i2c.write(0x3C, buf)
+
+# Command stream for _oled_set_pos: control byte, page, column low, column high
+_SET_POS_CMD = bytearray(4)
 
 def _oled_set_pos(col=0, page=0):
-    _oled_i2c_write_cmd(0xB0 | page)
-    _oled_i2c_write_cmd(0x00 | (col % 16))
-    _oled_i2c_write_cmd(0x10 | (col >> 4))
+    cmd = _SET_POS_CMD
+    cmd[1] = 0xB0 | page
+    cmd[2] = 0x00 | (col & 0x0F)
+    cmd[3] = 0x10 | (col >> 4)
+    i2c.write(0x3C, cmd)
+
+# SSD1306 setup commands, sent as one stream after a single 0x00 control byte
+_OLED_INIT_SEQ = bytes([
+    0x00,
+    0xAE, 0xA4, 0xD5, 0xF0, 0xA8, 0x3F, 0xD3, 0x00, 0x00, 0x8D, 0x14,
+    0x20, 0x00, 0x21, 0, 127, 0x22, 0, 63, 0xA0 | 0x1, 0xC8, 0xDA, 0x12,
+    0x81, 0xCF, 0xD9, 0xF1, 0xDB, 0x40, 0xA6, 0xD6, 0x00, 0xAF
+])
 
 def oled_init_display():
     global _oled_initialised
     try:
-        i2c.init(freq=400000, sda=pin20, scl=pin19)
+        i2c.init(freq=OLED_I2C_FREQ, sda=pin20, scl=pin19)
     except Exception as e:
         print("OLED i2c init failed: {}".format(e))
         raise
-    cmds = [
-        0xAE, 0xA4, 0xD5, 0xF0, 0xA8, 0x3F, 0xD3, 0x00, 0x00, 0x8D, 0x14,
-        0x20, 0x00, 0x21, 0, 127, 0x22, 0, 63, 0xA0 | 0x1, 0xC8, 0xDA, 0x12,
-        0x81, 0xCF, 0xD9, 0xF1, 0xDB, 0x40, 0xA6, 0xD6, 0x00, 0xAF
-    ]
-    for cmd in cmds:
-        _oled_i2c_write_cmd(cmd)
+    i2c.write(0x3C, _OLED_INIT_SEQ)
     _oled_initialised = True
     oled_clear_display()
 
 def oled_clear_display():
-    for page in range(8):
-        _oled_set_pos(0, page)
-        _oled_i2c_write_data(bytearray(128))
+    # Only runs at init, so the 1 KB blank frame is not kept around
+    blank = bytearray(1025)
+    blank[0] = 0x40
+    i2c.write(0x3C, _OLED_FULL_WINDOW)
+    i2c.write(0x3C, blank)
 
 def oled_show(input_data, line=0):
     global _oled_initialised
     if not _oled_initialised:
         oled_init_display()
-    pageBuf = bytearray(129)
-    pageBuf[0] = 0x40
+    # Local aliases: the glyph loop below is the OLED hot path
+    buf = _PAGE_BUF
+    glyphs = _GLYPH_VIEW
+    _ord = ord
     input_string = str(input_data) + " "
+    length = len(input_string)
     y = line
-    string_array = [input_string[i:i+26] for i in range(0, len(input_string), 26)]
-    for display_string in string_array:
-        for i, char in enumerate(display_string):
-            char_bytes = OLED_FONT[ord(char)]
-            for k in range(5):
-                col = sum((1 << (l + 1)) if char_bytes & (1 << (5 * k + l)) else 0 for l in range(5))
-                pageBuf[(i * 5) + k + 1] = col
+    start = 0
+    # 25 glyphs x 5 columns fill the 128-column page
+    while start < length:
+        end = min(start + 25, length)
+        buf[1:] = _BLANK_COLS
+        pos = 1
+        for i in range(start, end):
+            g = _ord(input_string[i]) * 5
+            buf[pos:pos + 5] = glyphs[g:g + 5]
+            pos += 5
         _oled_set_pos(0, y)
-        _oled_i2c_write_data(pageBuf)
+        _oled_i2c_write_page(buf)
         y += 1
+        start = end
 
 # ============== CONFIGURATION ==============
 HUB_ID = 0
 RADIO_GROUP = 42
 RADIO_POWER = 7
+RADIO_LENGTH = 24          # max frame size (largest is CLR, 12 bytes); sizes the receive buffer
+RADIO_QUEUE = 6            # frames the radio buffers between ticks
+RADIO_DATA_RATE = radio.RATE_2MBIT  # half the airtime of the 1 Mbit default
+OLED_I2C_FREQ = 400000     # nRF52833 TWI tops out at 400 kHz
+LOOP_TICK_MS = 20          # main loop period; bounds radio/button reaction time
+RX_DRAIN_MAX = RADIO_QUEUE # frames handled per tick; a full queue empties in one
+ALERT_SPLASH_MS = 500      # how long a new alert's skull stays on the LEDs
+ACK_SPLASH_MS = 500        # how long the tick stays up after acknowledging
+CLR_SENDS = 2              # copies of each CLR frame, CLR_RESEND_MS apart
+CLR_RESEND_MS = 80
+STATUS_REFRESH_MS = 1000   # redraw LED/OLED status at least this often
+DEVICE_TIMEOUT_MS = 15000  # three missed wearable heartbeats
+DEVICE_FORGET_MS = DEVICE_TIMEOUT_MS * 10  # drop devices silent this long
+MAX_DEVICES = 64           # bound on tracked devices (micro:bit heap is small)
+DEBUG = False              # extra serial logging (device joins)
+
+# ============== PROTOCOL ==============
+# Binary frame header: type, sender, target, hop count, sequence number,
+# payload length. Keep in sync with wearable_device.py and docs/PROTOCOL.md.
+FRAME_FMT = "<BBBBHB"
+FRAME_HEADER_SIZE = 7
+SEQ_OFFSET = 4        # byte offset of the uint16 sequence number in the header
+SEEN_CACHE_SIZE = 16  # recent (sender, seq) pairs remembered to drop repeats
+MSG_FALL = 0
+MSG_HBEAT = 2
+MSG_ACK = 3
+MSG_CLR = 5
+MSG_IMPACT = 6
+MSG_DATA = 7
+ACCEL_FMT = "<H"  # FALL/IMPACT/DATA payload: acceleration magnitude in mg
 
 # ============== STATE ==============
 class DeviceInfo:
     def __init__(self, device_id):
         self.device_id = device_id
         self.last_seen = 0
+        self.online = False
         self.has_active_alert = False
 
 class HubState:
     def __init__(self):
         self.devices = {}
-        self.active_alerts = []
+        self.active_device_count = 0  # devices with online set
+        # Pending alerts: device_id -> (time, impact, seq). MicroPython dicts do
+        # not keep insertion order, so alert_ids holds the queue order.
+        self.alerts = {}
+        self.alert_ids = []
         self.showing_alert = False
         self.current_alert_device = None
         self.alert_cycle_start = 0
         self.oled_present = False
-        self.last_oled_lines = ()
+        self.ack_cache = {}  # device_id -> pre-built ACK frame, SEQ re-stamped per send
+        self.last_oled_lines = [""] * 8  # text on each OLED page (blank after init)
+        self.last_oled_state = None
+        self.dirty = True  # status changed; LED/OLED need a redraw
+        self.last_status_refresh = 0
+        self.display_hold_until = 0  # leave the LED matrix alone until then
+        self.last_display_frame = None  # what the LED matrix currently shows
+        self.seen = [-1] * SEEN_CACHE_SIZE  # ring of recent sender << 16 | seq
+        self.seen_idx = 0
+        self.tx_seq = 0
+        # Repeats of the last CLR still to go out, sent from the main loop
+        self.pending_msg = None
+        self.pending_sends = 0
+        self.pending_next = 0
 
 state = HubState()
 
 # ============== SETUP ==============
 def setup_radio():
     radio.on()
-    radio.config(group=RADIO_GROUP, power=RADIO_POWER)
+    radio.config(group=RADIO_GROUP, power=RADIO_POWER, length=RADIO_LENGTH,
+                 queue=RADIO_QUEUE, data_rate=RADIO_DATA_RATE)
 
 def setup_oled():
     try:
@@ -127,79 +218,158 @@ def setup_oled():
 
 # ============== MESSAGE FUNCTIONS ==============
 def parse_message(msg):
-    """Parse message format: TYPE|SENDER|TARGET|DATA"""
-    if msg is None:
+    """Parse a binary frame into (type, sender, target, seq, data)"""
+    if msg is None or len(msg) < FRAME_HEADER_SIZE:
         return None
-    try:
-        if isinstance(msg, (bytes, bytearray)):
-            msg = msg.decode("utf-8")
-    except:
+    msg_type, sender, target, hops, seq, length = struct.unpack_from(FRAME_FMT, msg, 0)
+    end = FRAME_HEADER_SIZE + length
+    if len(msg) < end:
         return None
-    
-    parts = msg.split("|")
-    if len(parts) >= 4:
-        try:
-            return {
-                'type': parts[0],
-                'sender': int(parts[1]),
-                'target': int(parts[2]),
-                'data': parts[3]
-            }
-        except ValueError:
-            return None
-    return None
-
-def create_message(msg_type, target_id, data):
-    """Create message: TYPE|SENDER|TARGET|DATA"""
-    return "{}|{}|{}|{}".format(msg_type, HUB_ID, target_id, data)
+    # Copy the payload out: msg may be a view of the reused receive buffer
+    return (msg_type, sender, target, seq, bytes(msg[FRAME_HEADER_SIZE:end]))
+
+def parse_accel(data):
+    """Extract mg from a packed acceleration payload, or 0 if too short"""
+    if len(data) < 2:
+        return 0
+    return struct.unpack_from(ACCEL_FMT, data, 0)[0]
+
+# Incoming frames land in one reused buffer instead of a new bytes each
+_RX_BUF = bytearray(RADIO_LENGTH)
+_RX_VIEW = memoryview(_RX_BUF)
+
+# Outgoing frames are composed in place in a shared buffer
+_MSG_BUF = bytearray(32)
+_MSG_VIEW = memoryview(_MSG_BUF)
+
+def next_seq():
+    """Sequence number for a new frame; resend the same frame to retry"""
+    state.tx_seq = (state.tx_seq + 1) & 0xFFFF
+    return state.tx_seq
+
+def create_message(msg_type, target_id, data, hops=0):
+    """Create binary frame: header followed by data bytes
+
+    Returns a view of the shared send buffer, valid until the next call.
+    Resends of the returned frame keep its sequence number.
+    """
+    end = FRAME_HEADER_SIZE + len(data)
+    struct.pack_into(FRAME_FMT, _MSG_BUF, 0, msg_type, HUB_ID, target_id, hops,
+                     next_seq(), len(data))
+    _MSG_BUF[FRAME_HEADER_SIZE:end] = data
+    return _MSG_VIEW[:end]
 
 def send_ack(device_id):
     """Send acknowledgment to device"""
-    msg = create_message("ACK", device_id, "OK")
-    radio.send(msg)
-
-def send_clear(device_id):
-    """Notify device that alert was acknowledged"""
-    msg = create_message("CLR", device_id, "RESET")
-    for _ in range(2):
-        radio.send(msg)
-        sleep(80)
+    msg = state.ack_cache.get(device_id)
+    if msg is None:
+        # Only the sequence number changes between ACKs to a device; build
+        # each frame once and stamp a fresh SEQ on later sends
+        msg = bytearray(create_message(MSG_ACK, device_id, b"OK"))
+        state.ack_cache[device_id] = msg
+    else:
+        struct.pack_into("<H", msg, SEQ_OFFSET, next_seq())
+    radio.send_bytes(msg)
+
+def send_clear(device_id, now):
+    """Notify device that alert was acknowledged; repeats go out via send_pending"""
+    # Copied out of the shared buffer, which the next ACK may overwrite
+    msg = bytes(create_message(MSG_CLR, device_id, b"RESET"))
+    radio.send_bytes(msg)
+    state.pending_msg = msg
+    state.pending_sends = CLR_SENDS - 1
+    state.pending_next = now + CLR_RESEND_MS
+
+def send_pending(now):
+    """Send the next queued CLR copy once its gap has passed"""
+    if state.pending_sends and now >= state.pending_next:
+        radio.send_bytes(state.pending_msg)
+        state.pending_sends -= 1
+        state.pending_next = now + CLR_RESEND_MS
+
+def seen_recently(sender, seq):
+    """Record (sender, seq); True if it was already among the recent frames"""
+    key = sender << 16 | seq
+    if key in state.seen:
+        return True
+    state.seen[state.seen_idx] = key
+    state.seen_idx = (state.seen_idx + 1) % SEEN_CACHE_SIZE
+    return False
 
 # ============== DEVICE MANAGEMENT ==============
 def get_or_create_device(device_id):
     if device_id not in state.devices:
+        if len(state.devices) >= MAX_DEVICES:
+            evict_oldest_device()
         state.devices[device_id] = DeviceInfo(device_id)
+        state.dirty = True
     return state.devices[device_id]
 
-def update_device_seen(device_id):
+def evict_oldest_device():
+    """Make room by forgetting the longest-silent device without an alert"""
+    oldest = None
+    for device in state.devices.values():
+        if device.has_active_alert:
+            continue
+        if oldest is None or device.last_seen < oldest.last_seen:
+            oldest = device
+    if oldest is not None:
+        forget_device(oldest)
+
+def forget_device(device):
+    """Remove a device and its cached ACK, keeping the online count in step"""
+    if device.online:
+        state.active_device_count -= 1
+    del state.devices[device.device_id]
+    state.ack_cache.pop(device.device_id, None)
+
+def update_device_seen(device_id, now):
     device = get_or_create_device(device_id)
-    device.last_seen = running_time()
+    device.last_seen = now
+    if not device.online:
+        device.online = True
+        state.active_device_count += 1
+        state.dirty = True
     return device
 
+def check_offline_devices(now):
+    """Mark silent devices offline and forget those gone for DEVICE_FORGET_MS"""
+    purge = []
+    for device in state.devices.values():
+        age = now - device.last_seen
+        if device.online and age > DEVICE_TIMEOUT_MS:
+            device.online = False
+            state.active_device_count -= 1
+            state.dirty = True
+        if age > DEVICE_FORGET_MS and not device.has_active_alert:
+            purge.append(device)
+    for device in purge:
+        forget_device(device)
+
 # ============== ALERT HANDLING ==============
-def handle_fall_alert(sender, data):
+def handle_fall_alert(sender, seq, data, now):
     """Process fall alert"""
-    device = update_device_seen(sender)
+    device = update_device_seen(sender, now)
     device.has_active_alert = True
     
-    # Parse acceleration from data
-    accel = 0
-    if "ACC:" in data:
-        try:
-            accel = int(data.split("ACC:")[1])
-        except:
-            pass
+    # seen_recently drops most resent copies, but its ring can wrap within
+    # one resend burst when many devices are talking; just ACK those again
+    alert = state.alerts.get(sender)
+    if alert is not None and alert[2] == seq:
+        send_ack(sender)
+        return
     
-    # Add to active alerts
-    state.active_alerts.append({
-        'device_id': sender,
-        'time': running_time(),
-        'impact': accel
-    })
+    accel = parse_accel(data)
+    state.dirty = True
     
-    state.showing_alert = True
-    state.current_alert_device = sender
-    state.alert_cycle_start = running_time()
+    # A new fall. A device already in the queue keeps its place so the queue
+    # never outgrows the device count; its latest fall is still reported below.
+    if alert is None:
+        state.alert_ids.append(sender)
+        state.showing_alert = True
+        state.current_alert_device = sender
+        state.alert_cycle_start = now
+    state.alerts[sender] = (now, accel, seq)
     
     # Output to serial for desktop client (sensor_id,status,magnitude)
     print("{},FALL,{}".format(sender, accel))
@@ -210,48 +380,51 @@ def handle_fall_alert(sender, data):
     print("Impact: {} mg".format(accel))
     print("=" * 40)
     
-    # Visual alert
-    display.show(Image.SKULL)
-    sleep(500)
+    # Visual alert, held by update_display without blocking the radio loop
+    show_frame(Image.SKULL)
+    state.display_hold_until = now + ALERT_SPLASH_MS
     
     # Send ACK to sensor
     send_ack(sender)
 
-def handle_heartbeat(sender, data):
+def handle_heartbeat(sender, seq, data, now):
     """Update presence when a wearable pings the hub"""
     was_known = sender in state.devices
-    update_device_seen(sender)
-    if not was_known:
+    update_device_seen(sender, now)
+    if DEBUG and not was_known:
         print("Device {} joined".format(sender))
 
-def handle_impact(sender, data):
+def handle_impact(sender, seq, data, now):
     """Log an immediate impact snapshot for desktop plotting"""
-    update_device_seen(sender)
-    accel = 0
-    if "ACC:" in data:
-        try:
-            accel = int(data.split("ACC:")[1])
-        except:
-            pass
-    print("{},IMPACT,{}".format(sender, accel))
-
-def acknowledge_alert():
+    update_device_seen(sender, now)
+    accel = parse_accel(data)
+    print(sender, "IMPACT", accel, sep=",")
+
+def handle_data(sender, seq, data, now):
+    """Forward an acceleration sample for desktop plotting"""
+    # Wearables skip heartbeats while they send DATA, so it counts as presence
+    update_device_seen(sender, now)
+    accel = parse_accel(data)
+    print(sender, "DATA", accel, sep=",")
+
+def acknowledge_alert(now):
     """Acknowledge and clear current alert (button press)"""
-    if state.active_alerts:
-        alert = state.active_alerts.pop(0)
-        device = state.devices.get(alert['device_id'])
+    if state.alert_ids:
+        state.dirty = True
+        device_id = state.alert_ids.pop(0)
+        del state.alerts[device_id]
+        device = state.devices.get(device_id)
         if device:
             device.has_active_alert = False
         
         # Notify sensor that alert was acknowledged
-        send_clear(alert['device_id'])
-        print("Alert acknowledged for device {}".format(alert['device_id']))
+        send_clear(device_id, now)
+        print("Alert acknowledged for device {}".format(device_id))
         
         # Move to next alert if any
-        if state.active_alerts:
-            next_alert = state.active_alerts[0]
-            state.current_alert_device = next_alert['device_id']
-            state.alert_cycle_start = running_time()
+        if state.alert_ids:
+            state.current_alert_device = state.alert_ids[0]
+            state.alert_cycle_start = now
             state.showing_alert = True
         else:
             state.showing_alert = False
@@ -261,14 +434,17 @@ def acknowledge_alert():
 
 # ============== OLED FUNCTIONS ==============
 def oled_write(lines):
-    """Write lines to OLED display"""
+    """Write lines to OLED display, redrawing only lines that changed"""
     if not state.oled_present:
         return
     try:
-        oled_clear_display()
-        for idx, text in enumerate(lines[:8]):
-            oled_show(str(text)[:26], line=idx)
-        state.last_oled_lines = tuple(lines[:8])
+        last = state.last_oled_lines
+        for idx in range(8):
+            # 24 chars + oled_show's trailing space fill exactly one page
+            text = str(lines[idx])[:24] if idx < len(lines) else ""
+            if text != last[idx]:
+                oled_show(text, line=idx)
+                last[idx] = text
     except:
         state.oled_present = False
 
@@ -277,13 +453,18 @@ def update_oled():
     if not state.oled_present:
         return
     
+    impact = "?"
+    if state.showing_alert:
+        alert = state.alerts.get(state.current_alert_device)
+        if alert is not None:
+            impact = alert[1]
+    # The lines are built from these values only; skip formatting if unchanged
+    key = (state.showing_alert, state.current_alert_device, impact, state.active_device_count, len(state.alert_ids))
+    if key == state.last_oled_state:
+        return
+    state.last_oled_state = key
+    
     if state.showing_alert:
-        alert = None
-        for a in state.active_alerts:
-            if a['device_id'] == state.current_alert_device:
-                alert = a
-                break
-        impact = alert['impact'] if alert else "?"
         lines = [
             "ALERT dev {}".format(state.current_alert_device),
             "Impact: {} mg".format(impact),
@@ -292,67 +473,77 @@ def update_oled():
     else:
         lines = [
             "Hub online",
-            "Devices: {}".format(len(state.devices)),
-            "Alerts: {}".format(len(state.active_alerts))
+            "Devices: {}".format(state.active_device_count),
+            "Alerts: {}".format(len(state.alert_ids))
         ]
     
-    if tuple(lines) != state.last_oled_lines:
-        oled_write(lines)
+    oled_write(lines)
 
 # ============== DISPLAY ==============
-def show_alert_pattern(device_id):
+def show_frame(frame):
+    """Show text, a number or an Image (None clears) unless already on the LEDs"""
+    if frame == state.last_display_frame:
+        return
+    state.last_display_frame = frame
+    if frame is None:
+        display.clear()
+    else:
+        display.show(frame)
+
+def show_alert_pattern(device_id, now):
     """Flash device ID and ! alternately"""
     if device_id is None:
-        display.show("!")
+        show_frame("!")
         return
-    elapsed = (running_time() - state.alert_cycle_start) % 2000
+    elapsed = (now - state.alert_cycle_start) % 2000
     if elapsed < 500:
-        display.show(str(device_id))
+        show_frame(device_id)
+    elif (elapsed - 500) // 250 & 1:
+        show_frame(None)
     else:
-        flash_slot = int((elapsed - 500) // 250)
-        if flash_slot % 2 == 0:
-            display.show("!")
-        else:
-            display.clear()
+        show_frame("!")
 
-def update_display():
+def update_display(now):
     """Update LED matrix display"""
+    if state.display_hold_until:
+        if now < state.display_hold_until:
+            return
+        state.display_hold_until = 0
+    
     if state.showing_alert:
-        show_alert_pattern(state.current_alert_device)
+        show_alert_pattern(state.current_alert_device, now)
+        return
+    
+    if state.active_device_count > 0:
+        show_frame(state.active_device_count)
     else:
-        if len(state.devices) > 0:
-            display.show(str(len(state.devices)))
-        else:
-            display.show("-")
+        show_frame("-")
 
 # ============== MESSAGE PROCESSING ==============
-def process_message(msg):
+MESSAGE_HANDLERS = {
+    MSG_FALL: handle_fall_alert,
+    MSG_HBEAT: handle_heartbeat,
+    MSG_IMPACT: handle_impact,
+    MSG_DATA: handle_data,
+}
+
+def process_message(msg, now):
     """Process incoming radio message"""
     parsed = parse_message(msg)
-    if not parsed:
+    if parsed is None:
         return
     
-    if parsed['target'] != HUB_ID:
+    msg_type, sender, target, seq, data = parsed
+    if target != HUB_ID:
+        return
+    # Wearables repeat FALL and IMPACT frames for reliability; handle each once
+    if seen_recently(sender, seq):
         return
     
-    sender = parsed['sender']
-    msg_type = parsed['type']
-    data = parsed['data']
-    
-    if msg_type == 'FALL':
-        handle_fall_alert(sender, data)
-    elif msg_type == 'HBEAT':
-        handle_heartbeat(sender, data)
-    elif msg_type == 'IMPACT':
-        handle_impact(sender, data)
-    elif msg_type == 'DATA':
-        accel = 0
-        if "ACC:" in data:
-            try:
-                accel = int(data.split("ACC:")[1])
-            except:
-                pass
-        print("{},DATA,{}".format(sender, accel))
+    handler = MESSAGE_HANDLERS.get(msg_type)
+    if handler is not None:
+        handler(sender, seq, data, now)
+
 # ============== MAIN ==============
 def main():
     setup_radio()
@@ -361,27 +552,58 @@ def main():
     sleep(400)
     print("Central Hub started")
     
+    # Local aliases: the loop body runs every tick, and locals are cheaper
+    # to look up than module globals and attributes in MicroPython
+    st = state
+    clock = running_time
+    receive_into = radio.receive_bytes_into
+    rx_buf = _RX_BUF
+    rx_view = _RX_VIEW
+    process = process_message
+    was_pressed_a = button_a.was_pressed
+    was_pressed_b = button_b.was_pressed
+    
     while True:
-        # Process incoming messages
-        msg = radio.receive()
-        if msg:
-            process_message(msg)
+        now = clock()
+        
+        # Drain queued messages so bursts don't overflow the radio queue,
+        # bounded so a flood can't starve the buttons and display
+        for _ in range(RX_DRAIN_MAX):
+            n = receive_into(rx_buf)
+            if not n:
+                break
+            process(rx_view[:n], now)
         
         # Button B: acknowledge alert
-        if button_b.was_pressed():
-            if acknowledge_alert():
-                display.show(Image.YES)
-                sleep(500)
+        if was_pressed_b():
+            if acknowledge_alert(now):
+                show_frame(Image.YES)
+                st.display_hold_until = now + ACK_SPLASH_MS
+        if st.pending_sends:
+            send_pending(now)
         
         # Button A: print status
-        if button_a.was_pressed():
+        if was_pressed_a():
             print("\n--- Status ---")
-            print("Devices: {}".format(list(state.devices.keys())))
-            print("Active alerts: {}".format(len(state.active_alerts)))
+            print("Devices: {}".format(list(st.devices.keys())))
+            print("Active alerts: {}".format(len(st.alert_ids)))
             print("--------------\n")
         
-        update_display()
-        update_oled()
-        sleep(50)
+        # Periodic refresh; unchanged LED frames and OLED pages are skipped
+        if now - st.last_status_refresh >= STATUS_REFRESH_MS:
+            check_offline_devices(now)
+            st.dirty = True
+        # The alert pattern animates and splash holds expire; check them every tick
+        if st.dirty or st.showing_alert or st.display_hold_until:
+            update_display(now)
+        if st.dirty:
+            update_oled()
+            st.dirty = False
+            st.last_status_refresh = now
+        
+        # Sleep only for what is left of this tick
+        elapsed = clock() - now
+        if elapsed < LOOP_TICK_MS:
+            sleep(LOOP_TICK_MS - elapsed)
 
 main()
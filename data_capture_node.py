@@ -14,7 +14,6 @@ Output:
 """
 
 from microbit import *
-import math
 
 # ============== CONFIGURATION ==============
 DEVICE_ID = 1
@@ -25,11 +24,23 @@ SAMPLE_RATE_MS = 50
 THRESH2 = IMPACT_THRESHOLD_MG * IMPACT_THRESHOLD_MG
 
 
-def read_mag():
-    x = accelerometer.get_x()
-    y = accelerometer.get_y()
-    z = accelerometer.get_z()
-    return int(math.sqrt(x * x + y * y + z * z))
+def read_mag2():
+    """Squared acceleration magnitude in mg^2 (no sqrt on the sample path)"""
+    # One call, so all three axes come from the same sample
+    x, y, z = accelerometer.get_values()
+    return x * x + y * y + z * z
+
+
+def isqrt(n):
+    """Integer square root (floor) by Newton's method"""
+    if n <= 0:
+        return 0
+    x = n
+    y = (x + 1) // 2
+    while y < x:
+        x = y
+        y = (x + n // x) // 2
+    return x
 
 
 def capture_once(event_id):
@@ -43,14 +54,15 @@ def capture_once(event_id):
     while True:
         if button_b.was_pressed():
             return False  # stop script
-        mag = read_mag()
-        if mag * mag > THRESH2:
+        mag2 = read_mag2()
+        if mag2 > THRESH2:
             break
         sleep(SAMPLE_RATE_MS)
 
+    # Work in squared magnitudes; convert to mg only when emitting
     start_t = running_time()
-    t0_mag = mag
-    max_mag = mag
+    t0_mag2 = mag2
+    max_mag2 = mag2
     buckets = [None, None, None, None]  # for ~1s,2s,3s,4s marks
     next_mark = 1
 
@@ -59,31 +71,32 @@ def capture_once(event_id):
         if button_b.was_pressed():
             return False  # stop script
 
-        mag = read_mag()
-        if mag > max_mag:
-            max_mag = mag
+        mag2 = read_mag2()
+        if mag2 > max_mag2:
+            max_mag2 = mag2
 
         elapsed = running_time() - start_t
         # Set bucket when we cross each second mark
         if next_mark <= 4 and elapsed >= next_mark * 1000:
-            buckets[next_mark - 1] = mag
+            buckets[next_mark - 1] = mag2
             next_mark += 1
 
         sleep(SAMPLE_RATE_MS)
 
     # Fill any missing buckets with last known mag
-    last_val = buckets[0] if buckets[0] is not None else t0_mag
+    last_val = buckets[0] if buckets[0] is not None else t0_mag2
     for i in range(4):
         if buckets[i] is None:
             buckets[i] = last_val
         last_val = buckets[i]
+        buckets[i] = isqrt(buckets[i])
 
     # Emit CSV line
     print("{},{},{},{},{},{},{},{}".format(
         DEVICE_ID,
         event_id,
-        max_mag,
-        t0_mag,
+        isqrt(max_mag2),
+        isqrt(t0_mag2),
         buckets[0],
         buckets[1],
         buckets[2],
@@ -11,7 +11,7 @@ This completes the architecture:
                                               Analysis & Visualisation
 
 Requirements:
-    pip install pyserial matplotlib
+    pip install pyserial matplotlib numpy
 
 Usage:
     python desktop_client.py
@@ -21,18 +21,20 @@ import serial
 import serial.tools.list_ports
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
-from collections import deque
 from datetime import datetime
+import numpy as np
 import sys
 import re
+import time
 
 # ===== CONFIGURATION =====
 BAUD_RATE = 115200
 MAX_POINTS = 100  # Number of points on graph
 FALL_THRESHOLD_MG = 3200
+X_WINDOW_STEP_S = 10  # x axis grows in steps of this many seconds
 
 # ===== DATA STORAGE =====
-sensor_data = {}  # sensor_id -> {'times': deque, 'values': deque}
+sensor_data = {}  # sensor_id -> ring buffer, see ensure_sensor_data()
 fall_events = []  # List of fall event records
 stats = {
     'total_messages': 0,
@@ -76,55 +78,67 @@ def connect_serial():
         print(f"Error: {e}")
         sys.exit(1)
 
+_rx_tail = b''  # partial line left over from the previous read
+
+def read_serial_lines(ser):
+    """Read everything waiting on the port in one call; return complete lines"""
+    global _rx_tail
+    waiting = ser.in_waiting
+    if not waiting:
+        return []
+    *lines, _rx_tail = (_rx_tail + ser.read(waiting)).split(b'\n')
+    return lines
+
 # ===== MESSAGE PARSING =====
+ACC_PATTERN = re.compile(rb'ACC:(\d+)')
+
 def parse_hub_message(line):
     """
-    Parse messages from central_hub.py
+    Parse one raw serial line (bytes) from central_hub.py
     
     Expected formats from your hub:
     - "SENSOR_ID,STATUS,MAGNITUDE" (if simple format)
     - Or parse the protocol format: "TYPE|SENDER|TARGET|DATA|HOPS"
     
-    Adjust this based on your actual central_hub.py output format
+    Returns (sensor_id, status, magnitude) with status as bytes (b'FALL',
+    b'IMPACT', b'DATA', ...), or None. Works on bytes directly so the
+    common lines are never decoded.
     """
     line = line.strip()
     if not line:
         return None
     
     # Try simple CSV format: SENSOR_ID,STATUS,MAGNITUDE
-    parts = line.split(',')
-    if len(parts) >= 3:
-        try:
-            sensor_id = int(parts[0])
-            status = parts[1].strip()
-            magnitude = int(parts[2])
-            return {'sensor_id': sensor_id, 'status': status, 'magnitude': magnitude}
-        except ValueError:
-            pass
+    sensor_id, sep, rest = line.partition(b',')
+    if sep:
+        status, sep, magnitude = rest.partition(b',')
+        if sep:
+            try:
+                return (int(sensor_id), status.strip(), int(magnitude.partition(b',')[0]))
+            except ValueError:
+                pass
     
     # Try protocol format: TYPE|SENDER|TARGET|DATA|HOPS
-    parts = line.split('|')
-    if len(parts) >= 4:
+    msg_type, sep, rest = line.partition(b'|')
+    parts = rest.split(b'|') if sep else ()
+    if len(parts) >= 3:
         try:
-            msg_type = parts[0]
-            sender = int(parts[1])
-            data = parts[3]
+            sender = int(parts[0])
             
             # Extract magnitude from data if present
             magnitude = 1000  # default
-            if 'ACC:' in data:
-                match = re.search(r'ACC:(\d+)', data)
-                if match:
-                    magnitude = int(match.group(1))
+            match = ACC_PATTERN.search(parts[2])
+            if match:
+                magnitude = int(match.group(1))
             
-            status = 'FALL' if msg_type == 'FALL' else 'OK'
-            return {'sensor_id': sender, 'status': status, 'magnitude': magnitude, 'raw': line}
-        except (ValueError, IndexError):
+            status = b'FALL' if msg_type == b'FALL' else b'OK'
+            return (sender, status, magnitude)
+        except ValueError:
             pass
     
     # Log unrecognised format for debugging
-    if line and not line.startswith('='):  # Ignore separator lines
-        print(f"[DEBUG] Unrecognised: {line[:50]}")
+    if not line.startswith(b'='):  # Ignore separator lines
+        print(f"[DEBUG] Unrecognised: {line[:50].decode('utf-8', errors='replace')}")
     
     return None
 
@@ -132,43 +146,80 @@ def parse_hub_message(line):
 def ensure_sensor_data(sensor_id):
     """Create data storage for new sensor"""
     if sensor_id not in sensor_data:
+        # Fixed-size ring buffers: 'head' is the next slot to write,
+        # 't' holds time.monotonic() seconds so plotting needs no datetime maths
         sensor_data[sensor_id] = {
-            'times': deque(maxlen=MAX_POINTS),
-            'values': deque(maxlen=MAX_POINTS)
+            't': np.empty(MAX_POINTS, dtype=np.float64),
+            'v': np.empty(MAX_POINTS, dtype=np.int32),
+            'head': 0,
+            'count': 0,
+            'fresh': False  # samples added since the line was last updated
         }
 
+def store_sample(sensor_id, timestamp, magnitude):
+    """Append one sample to the sensor's ring buffer"""
+    ensure_sensor_data(sensor_id)
+    data = sensor_data[sensor_id]
+    head = data['head']
+    data['t'][head] = timestamp
+    data['v'][head] = magnitude
+    data['head'] = (head + 1) % MAX_POINTS
+    if data['count'] < MAX_POINTS:
+        data['count'] += 1
+    data['fresh'] = True
+
+def sensor_series(data):
+    """Return (times, values) of a ring buffer in chronological order"""
+    count = data['count']
+    if count < MAX_POINTS:
+        return data['t'][:count], data['v'][:count]
+    head = data['head']
+    if head == 0:
+        return data['t'], data['v']
+    return (np.concatenate((data['t'][head:], data['t'][:head])),
+            np.concatenate((data['v'][head:], data['v'][:head])))
+
 def analyse_message(parsed):
     """Perform analysis on incoming data"""
     if not parsed:
         return
     
-    sensor_id = parsed['sensor_id']
-    status = parsed['status']
-    magnitude = parsed['magnitude']
-    timestamp = datetime.now()
+    sensor_id, status, magnitude = parsed
+    # Monotonic seconds are enough for plotting; events read the wall clock
+    timestamp = time.monotonic()
     
     # Update statistics
     stats['total_messages'] += 1
     stats['devices_seen'].add(sensor_id)
     
     # Store data for plotting
-    ensure_sensor_data(sensor_id)
-    sensor_data[sensor_id]['times'].append(timestamp)
-    sensor_data[sensor_id]['values'].append(magnitude)
+    store_sample(sensor_id, timestamp, magnitude)
     
-    # Handle fall events
-    if status == 'FALL':
-        stats['fall_alerts'] += 1
-        fall_events.append({
-            'time': timestamp,
-            'sensor_id': sensor_id,
-            'magnitude': magnitude
-        })
-        print_fall_alert(sensor_id, magnitude, timestamp)
-    
-    elif status == 'IMPACT':
-        stats['impacts_detected'] += 1
-        print(f"[{timestamp.strftime('%H:%M:%S')}] Sensor {sensor_id}: Impact detected ({magnitude} mg)")
+    # Events get extra handling; plain DATA samples have no entry
+    handler = EVENT_HANDLERS.get(status)
+    if handler is not None:
+        handler(sensor_id, magnitude)
+
+def handle_fall(sensor_id, magnitude):
+    """Record and announce a fall event"""
+    timestamp = datetime.now()
+    stats['fall_alerts'] += 1
+    fall_events.append({
+        'time': timestamp,
+        'sensor_id': sensor_id,
+        'magnitude': magnitude
+    })
+    print_fall_alert(sensor_id, magnitude, timestamp)
+
+def handle_impact(sensor_id, magnitude):
+    """Count and log an impact event"""
+    stats['impacts_detected'] += 1
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] Sensor {sensor_id}: Impact detected ({magnitude} mg)")
+
+EVENT_HANDLERS = {
+    b'FALL': handle_fall,
+    b'IMPACT': handle_impact,
+}
 
 def print_fall_alert(sensor_id, magnitude, timestamp):
     """Print formatted fall alert"""
@@ -220,7 +271,11 @@ def setup_plot():
         ax.axhline(y=1000, color='green', linestyle=':', alpha=0.7, label='Rest state (1000mg)')
         ax.legend(loc='upper right', fontsize=8)
         
-        line, = ax.plot([], [], color=colors[i % len(colors)], linewidth=1.5)
+        ax.set_xlim(0, X_WINDOW_STEP_S)
+        
+        # Only the lines are animated; axes, thresholds and legend are drawn
+        # once and restored from the blit background each frame
+        line, = ax.plot([], [], color=colors[i % len(colors)], linewidth=1.5, animated=True)
         lines[i + 1] = line  # Sensor IDs typically start at 1
     
     axes[-1].set_xlabel('Time (seconds)')
@@ -232,37 +287,42 @@ def update_plot(frame, ser, axes, lines):
     """Animation update - read serial and update graphs"""
     
     # Read all available serial data
-    while ser.in_waiting:
-        try:
-            raw = ser.readline()
-            line = raw.decode('utf-8', errors='ignore').strip()
-            if line:
-                parsed = parse_hub_message(line)
-                if parsed:
-                    analyse_message(parsed)
-        except serial.SerialException:
-            pass
+    try:
+        for raw in read_serial_lines(ser):
+            parsed = parse_hub_message(raw)
+            if parsed:
+                analyse_message(parsed)
+    except serial.SerialException:
+        pass
     
     # Update each sensor's plot
     for sensor_id, line_obj in lines.items():
         if sensor_id in sensor_data:
             data = sensor_data[sensor_id]
-            if len(data['times']) > 1:
-                times = list(data['times'])
-                values = list(data['values'])
+            # Sensors report every ~500 ms, so most frames have nothing new
+            if data['fresh'] and data['count'] > 1:
+                data['fresh'] = False
+                times, values = sensor_series(data)
+                rel_times = times - times[0]
                 
-                t0 = times[0]
-                rel_times = [(t - t0).total_seconds() for t in times]
+                ax_idx = sensor_id - 1  # Convert sensor_id to axis index
+                ax = axes[ax_idx] if ax_idx < len(axes) else None
                 
-                line_obj.set_data(rel_times, values)
+                # Never draw more vertices than the axis is pixels wide
+                width_px = int(ax.bbox.width) if ax is not None else 0
+                if width_px and len(values) > width_px:
+                    stride = len(values) // width_px + 1
+                    line_obj.set_data(rel_times[::stride], values[::stride])
+                else:
+                    line_obj.set_data(rel_times, values)
                 
-                # Update axis limits
-                ax_idx = sensor_id - 1  # Convert sensor_id to axis index
-                if ax_idx < len(axes):
-                    axes[ax_idx].set_xlim(
-                        rel_times[0], 
-                        max(rel_times[-1], rel_times[0] + 10)
-                    )
+                # Grow the x axis in whole steps; changing the limits forces a
+                # full redraw, which blitting otherwise avoids
+                if ax is not None:
+                    if rel_times[-1] > ax.get_xlim()[1]:
+                        steps = int(rel_times[-1] // X_WINDOW_STEP_S) + 1
+                        ax.set_xlim(0, steps * X_WINDOW_STEP_S)
+                        ax.figure.canvas.draw()
     
     return list(lines.values())
 
@@ -295,7 +355,7 @@ def main():
         update_plot,
         fargs=(ser, axes, lines),
         interval=100,
-        blit=False,
+        blit=True,
         cache_frame_data=False
     )
     
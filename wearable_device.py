@@ -9,182 +9,378 @@ Flash to each sensor MicroBit (change DEVICE_ID for each)
 
 from microbit import *
 import radio
-import math
+import micropython
+import random
+import struct
 
 # ============== CONFIGURATION ==============
 DEVICE_ID = 2              # CHANGE THIS: 1, 2, etc. for each sensor
 HUB_ID = 0
 RADIO_GROUP = 42
 RADIO_POWER = 7
+# Must match the hub: both ends need the same data rate to hear each other
+RADIO_LENGTH = 24          # max frame size (largest sent is 11 bytes)
+RADIO_QUEUE = 6            # frames the radio buffers between loop passes
+RADIO_DATA_RATE = radio.RATE_2MBIT  # half the airtime of the 1 Mbit default
 
 # Fall detection thresholds
 IMPACT_THRESHOLD = 3200        # mg (3.2g) - spike detection
+IMPACT_WINDOW = 5              # samples considered for the spike
+IMPACT_MIN_SAMPLES = 2         # of those, how many must exceed the threshold
+FREEFALL_THRESHOLD = 600       # mg - dip below this just before the impact
+FREEFALL_WINDOW = 4            # samples (~200 ms) searched for the dip
 STILLNESS_THRESHOLD = 150      # mg - deviation from 1g
+# Squared forms so the per-sample checks need no square root
+IMPACT_SQ = IMPACT_THRESHOLD * IMPACT_THRESHOLD
+FREEFALL_SQ = FREEFALL_THRESHOLD * FREEFALL_THRESHOLD
+STILL_LO_SQ = (1000 - STILLNESS_THRESHOLD) ** 2
+STILL_HI_SQ = (1000 + STILLNESS_THRESHOLD) ** 2
 STILLNESS_DURATION_MS = 2000   # 2 seconds still = fall confirmed
+# The board must be worn flat (LED face up or down) while the wearer stands,
+# so z is vertical when upright; see "Mounting the wearable" in docs/SETUP.md
+TILT_COS2_PCT = 33             # lying = z axis over 55 deg from vertical (cos^2 55 ~ 0.33)
 POST_IMPACT_WINDOW_MS = 4000   # 4 seconds to detect stillness after impact
 
 SAMPLE_RATE_MS = 50
 HEARTBEAT_INTERVAL_MS = 5000   # advertise presence to the hub every 5s
+FALL_SENDS = 3                 # copies of each FALL frame, FALL_RESEND_MS apart
+FALL_RESEND_MS = 100
+IMPACT_SENDS = 2               # copies of each IMPACT frame, IMPACT_RESEND_MS apart
+IMPACT_RESEND_MS = 50
+FALL_FACE_MS = 2000            # how long the sad face stays up after a fall
 
-last_data_send = 0
-DATA_SEND_INTERVAL_MS = 500  # Send data every 500ms
+DATA_SEND_INTERVAL_MS = 500  # Check for a new data sample every 500ms
+DATA_DELTA_MG = 50           # ...but only send it if it moved this much
+DATA_MAX_GAP_MS = 5000       # ...or nothing was sent for this long
+
+# ============== PROTOCOL ==============
+# Binary frame header: type, sender, target, hop count, sequence number,
+# payload length. Keep in sync with central_hub.py and docs/PROTOCOL.md.
+FRAME_FMT = "<BBBBHB"
+MSG_FALL = 0
+MSG_HBEAT = 2
+MSG_IMPACT = 6
+MSG_DATA = 7
+# Every frame this node sends has a fixed-size payload, so header and
+# payload are packed together in a single call
+ACCEL_FRAME_FMT = FRAME_FMT + "H"  # FALL/IMPACT/DATA: payload is mg as uint16
+ACCEL_LEN = 2
+HBEAT_FRAME_FMT = FRAME_FMT + "I"  # HBEAT: payload is running_time() as uint32
+HBEAT_LEN = 4
+# Periodic DATA and HBEAT frames are packed into these in place; FALL and
+# IMPACT frames get their own bytes because send_pending() resends them
+_DATA_BUF = bytearray(struct.calcsize(ACCEL_FRAME_FMT))
+_HBEAT_BUF = bytearray(struct.calcsize(HBEAT_FRAME_FMT))
+# Wearables ignore everything they receive (including the hub's ACK/CLR),
+# but the radio still queues it; it is read into this and dropped
+_RX_BUF = bytearray(RADIO_LENGTH)
 
 # ============== STATE ==============
-impact_detected = False
+# Detector state: looking for an impact, or watching for stillness after one
+STATE_IDLE = 0
+STATE_POST_IMPACT = 1
+detector_state = STATE_IDLE
 impact_time = 0
-monitoring_stillness = False
 still_start_time = 0
-last_heartbeat_sent = 0
-impact_peak_mag = 0
+# Deadline (running_time ms) for the next heartbeat; 0 = send at once
+next_heartbeat = 0
+impact_peak_sq = 0
+recent_sq = [IMPACT_SQ] * FREEFALL_WINDOW  # last few squared samples
+recent_idx = 0
+impact_hits = bytearray(IMPACT_WINDOW)  # 1 where that sample was over IMPACT_SQ
+impact_hit_idx = 0
+impact_hit_count = 0
+impact_dip = False  # a free-fall dip came before the hits now in the window
+# Repeats of the last frame still to go out, sent from the main loop
+pending_msg = None
+pending_sends = 0
+pending_gap = 0
+pending_next = 0
+display_hold_until = 0  # leave the LEDs alone until then
+shown_icon = None  # what show_icon last put on the LEDs
+# Random start so frames sent after a reset don't look like repeats to the hub
+tx_seq = random.getrandbits(16)
 
 # ============== SETUP ==============
 radio.on()
-radio.config(group=RADIO_GROUP, power=RADIO_POWER)
+radio.config(group=RADIO_GROUP, power=RADIO_POWER, length=RADIO_LENGTH,
+             queue=RADIO_QUEUE, data_rate=RADIO_DATA_RATE)
 
 # ============== FUNCTIONS ==============
+def show_icon(icon):
+    """Show an Image or short text unless it is already on the LEDs"""
+    global shown_icon
+    if icon == shown_icon:
+        return
+    shown_icon = icon
+    display.show(icon)
+
+def scroll_text(text):
+    """Scroll text; the LEDs no longer hold the last icon afterwards"""
+    global shown_icon
+    display.scroll(text)
+    shown_icon = None
+
+@micropython.native
+def get_magnitude_sq():
+    """Squared total acceleration in milli-g squared"""
+    # One call, so all three axes come from the same sample
+    x, y, z = accelerometer.get_values()
+    return x*x + y*y + z*z
+
+def isqrt(n):
+    """Integer square root (floor) by Newton's method"""
+    if n <= 0:
+        return 0
+    x = n
+    y = (x + 1) // 2
+    while y < x:
+        x = y
+        y = (x + n // x) // 2
+    return x
+
 def get_magnitude():
     """Total acceleration in milli-g"""
-    x = accelerometer.get_x()
-    y = accelerometer.get_y()
-    z = accelerometer.get_z()
-    return math.sqrt(x*x + y*y + z*z)
+    return isqrt(get_magnitude_sq())
+
+def next_seq():
+    """Sequence number for a new frame; resend the same frame to retry"""
+    global tx_seq
+    tx_seq = (tx_seq + 1) & 0xFFFF
+    return tx_seq
 
-def create_message(msg_type, data):
-    """Create message: TYPE|SENDER|TARGET|DATA"""
-    return "{}|{}|{}|{}".format(msg_type, DEVICE_ID, HUB_ID, data)
+def create_accel_message(msg_type, accel):
+    """Create a FALL, IMPACT or DATA frame carrying accel in mg"""
+    return struct.pack(ACCEL_FRAME_FMT, msg_type, DEVICE_ID, HUB_ID, 0,
+                       next_seq(), ACCEL_LEN, min(accel, 0xFFFF))
+
+def send_repeated(msg, count, gap_ms):
+    """Send msg now and leave count - 1 copies for send_pending()"""
+    global pending_msg, pending_sends, pending_gap, pending_next
+    radio.send_bytes(msg)
+    pending_msg = msg
+    pending_sends = count - 1
+    pending_gap = gap_ms
+    pending_next = running_time() + gap_ms
+
+def send_pending(now):
+    """Send the next queued copy once its gap has passed"""
+    global pending_sends, pending_next
+    if pending_sends and now >= pending_next:
+        radio.send_bytes(pending_msg)
+        pending_sends -= 1
+        pending_next = now + pending_gap
 
 def send_fall_alert():
     """Send fall alert to hub"""
-    global impact_peak_mag
-    accel = impact_peak_mag if impact_peak_mag else int(get_magnitude())
-    msg = create_message("FALL", "ACC:{}".format(accel))
+    global impact_peak_sq, display_hold_until
+    accel = isqrt(impact_peak_sq) if impact_peak_sq else get_magnitude()
+    msg = create_accel_message(MSG_FALL, accel)
     
-    # Send multiple times for reliability
-    for _ in range(3):
-        radio.send(msg)
-        sleep(100)
+    # Send multiple times for reliability, without blocking sampling
+    send_repeated(msg, FALL_SENDS, FALL_RESEND_MS)
 
-    impact_peak_mag = 0  # reset for next event
+    impact_peak_sq = 0  # reset for next event
     
     # Visual feedback
-    display.show(Image.SAD)
-    sleep(2000)
+    show_icon(Image.SAD)
+    display_hold_until = running_time() + FALL_FACE_MS
 
 def send_impact_event(accel):
     """Send immediate impact snapshot for desktop plotting."""
-    msg = create_message("IMPACT", "ACC:{}".format(accel))
-    for _ in range(2):
-        radio.send(msg)
-        sleep(50)
+    msg = create_accel_message(MSG_IMPACT, accel)
+    send_repeated(msg, IMPACT_SENDS, IMPACT_RESEND_MS)
 
-def send_heartbeat():
+def send_heartbeat(now):
     """Send a lightweight presence ping so the hub tracks this device"""
-    radio.send(create_message("HBEAT", str(running_time())))
+    struct.pack_into(HBEAT_FRAME_FMT, _HBEAT_BUF, 0, MSG_HBEAT, DEVICE_ID, HUB_ID, 0,
+                     next_seq(), HBEAT_LEN, now)
+    radio.send_bytes(_HBEAT_BUF)
+
+def send_data(accel, now):
+    """Send a DATA sample for desktop plotting; it doubles as a heartbeat"""
+    global next_heartbeat
+    struct.pack_into(ACCEL_FRAME_FMT, _DATA_BUF, 0, MSG_DATA, DEVICE_ID, HUB_ID, 0,
+                     next_seq(), ACCEL_LEN, min(accel, 0xFFFF))
+    radio.send_bytes(_DATA_BUF)
+    # The hub counts any DATA as presence, so only ping after a quiet spell
+    next_heartbeat = now + HEARTBEAT_INTERVAL_MS
 
-def maybe_send_heartbeat():
-    """Emit heartbeat at a fixed interval"""
-    global last_heartbeat_sent
-    now = running_time()
-    if last_heartbeat_sent == 0 or now - last_heartbeat_sent >= HEARTBEAT_INTERVAL_MS:
-        send_heartbeat()
-        last_heartbeat_sent = now
+def maybe_send_heartbeat(now):
+    """Emit heartbeat at a fixed interval; now is running_time() in ms"""
+    global next_heartbeat
+    if now >= next_heartbeat:
+        send_heartbeat(now)
+        next_heartbeat = now + HEARTBEAT_INTERVAL_MS
 
-def analyze_movement():
+@micropython.native
+def analyze_movement(now):
     """
     Fall detection algorithm:
-    1. Detect impact spike (>3.2g)
-    2. Monitor for stillness after impact
+    1. Detect impact spike (>3.2g on 2 of 5 samples) preceded by a
+       free-fall dip (<0.6g)
+    2. Monitor for stillness after impact; stillness that ends upright
+       does not count
     3. Confirm fall if still for 2 seconds within 4 second window
     """
-    global impact_detected, impact_time, monitoring_stillness, still_start_time, impact_peak_mag
+    global detector_state, impact_time, still_start_time, impact_peak_sq
+    global recent_idx, impact_hit_idx, impact_hit_count, impact_dip
     
-    now = running_time()
-    magnitude = get_magnitude()
-    mag_int = int(magnitude)
+    # Read the axes here rather than via get_magnitude_sq: the tilt check needs z
+    x, y, z = accelerometer.get_values()
+    mag_sq = x*x + y*y + z*z
     
-    if not monitoring_stillness:
-        # Phase 1: Looking for impact
-        if magnitude > IMPACT_THRESHOLD:
-            impact_detected = True
+    if detector_state == STATE_IDLE:
+        # Phase 1: Looking for impact. A single noisy sample or a bump
+        # without a free-fall dip is ignored.
+        hit = 1 if mag_sq > IMPACT_SQ else 0
+        impact_hit_count += hit - impact_hits[impact_hit_idx]
+        impact_hits[impact_hit_idx] = hit
+        impact_hit_idx = (impact_hit_idx + 1) % IMPACT_WINDOW
+        # The dip is looked for before the first hit of the window: by the
+        # time the last needed hit arrives, up to IMPACT_WINDOW - 1 samples
+        # later, it may have slid out of the FREEFALL_WINDOW ring
+        if hit:
+            dip = min(recent_sq) < FREEFALL_SQ
+            impact_dip = dip if impact_hit_count == 1 else (impact_dip or dip)
+        if hit and impact_hit_count >= IMPACT_MIN_SAMPLES and impact_dip:
+            detector_state = STATE_POST_IMPACT
             impact_time = now
-            monitoring_stillness = True
             still_start_time = 0
-            impact_peak_mag = mag_int
-            send_impact_event(mag_int)
-            display.show("!")
+            impact_peak_sq = max(mag_sq, max(recent_sq))
+            for i in range(FREEFALL_WINDOW):
+                recent_sq[i] = IMPACT_SQ  # this dip is used up
+            for i in range(IMPACT_WINDOW):
+                impact_hits[i] = 0
+            impact_hit_count = 0
+            impact_dip = False
+            send_impact_event(isqrt(impact_peak_sq))
+            show_icon("!")
             return False
+        recent_sq[recent_idx] = mag_sq
+        recent_idx = (recent_idx + 1) % FREEFALL_WINDOW
     else:
         # Phase 2: Monitoring for stillness after impact
-        if mag_int > impact_peak_mag:
-            impact_peak_mag = mag_int
-        deviation = abs(magnitude - 1000)
+        if mag_sq > impact_peak_sq:
+            impact_peak_sq = mag_sq
         
-        if deviation < STILLNESS_THRESHOLD:
+        if STILL_LO_SQ < mag_sq < STILL_HI_SQ:
             # Device is still
             if still_start_time == 0:
                 still_start_time = now
             
             # Check if still long enough
             if now - still_start_time >= STILLNESS_DURATION_MS:
-                # FALL CONFIRMED
-                monitoring_stillness = False
-                impact_detected = False
-                return True
+                # Only gravity acts after settling, so z gives the posture.
+                # Readings near 1 g also pass by while the body tumbles, so
+                # posture is judged here, not on the first still sample.
+                if z * z * 100 >= mag_sq * TILT_COS2_PCT:
+                    # Still but upright: treat as movement and keep watching
+                    # until the post-impact window runs out
+                    still_start_time = 0
+                else:
+                    # FALL CONFIRMED
+                    detector_state = STATE_IDLE
+                    return True
         else:
             # Movement detected - reset stillness timer
             still_start_time = 0
         
         # Timeout - too long since impact without sustained stillness
         if now - impact_time > POST_IMPACT_WINDOW_MS:
-            monitoring_stillness = False
-            impact_detected = False
-            impact_peak_mag = 0
-            display.show(Image.HAPPY)
+            detector_state = STATE_IDLE
+            impact_peak_sq = 0
+            show_icon(Image.HAPPY)
     
     return False
 
 def run_test_mode():
     """Test mode - press A to simulate fall, B to show acceleration"""
-    display.scroll("TEST")
+    scroll_text("TEST")
     while True:
-        maybe_send_heartbeat()
-        if button_a.was_pressed():
-            display.scroll("FALL")
-            send_fall_alert()
-        if button_b.was_pressed():
-            mag = int(get_magnitude())
-            display.scroll(str(mag))
-        if button_a.is_pressed() and button_b.is_pressed():
+        now = running_time()
+        maybe_send_heartbeat(now)
+        send_pending(now)
+        # Press counts are buffered between polls, so quick presses still count
+        presses_a = button_a.get_presses()
+        presses_b = button_b.get_presses()
+        if presses_a and presses_b:
             break
-        sleep(100)
+        if presses_a:
+            scroll_text("FALL")
+            send_fall_alert()
+        if presses_b:
+            mag = get_magnitude()
+            scroll_text(str(mag))
+        # Poll at most every 100 ms, waking early for a due heartbeat
+        delay = min(100, next_heartbeat - running_time())
+        if delay > 0:
+            sleep(delay)
 
 # ============== MAIN ==============
-display.show(str(DEVICE_ID))
-sleep(1000)
-maybe_send_heartbeat()  # initial presence beacon
-
-# Hold A on startup for test mode
-if button_a.is_pressed():
-    run_test_mode()
-
-# Main loop
-while True:
-    maybe_send_heartbeat()
-    fall_detected = analyze_movement()
+@micropython.native
+def main():
+    display.show(str(DEVICE_ID))
+    sleep(1000)
+    maybe_send_heartbeat(running_time())  # initial presence beacon
     
-    if fall_detected:
-        send_fall_alert()
+    # Hold A on startup for test mode
+    if button_a.is_pressed():
+        run_test_mode()
     
-    # Show status
-    if not monitoring_stillness:
-        display.show(Image.HEART_SMALL)
-
-    now = running_time()
+    # Local aliases: locals are cheaper to look up than module globals and
+    # attributes in MicroPython, and this loop runs every sample forever
+    clock = running_time
+    heartbeat = maybe_send_heartbeat
+    analyze = analyze_movement
+    pending = send_pending
+    receive_into = radio.receive_bytes_into
+    rx_buf = _RX_BUF
+    heart = Image.HEART_SMALL
+    next_data_send = 0
+    last_data_mag = 0
+    last_data_sent = 0
     
-    if now - last_data_send >= DATA_SEND_INTERVAL_MS:
-        last_data_send = now
-        mag = int(get_magnitude())
-        msg = create_message("DATA", "ACC:{}".format(mag))
-        radio.send(msg)
-    
-    sleep(SAMPLE_RATE_MS)
+    # Main loop: samples are taken on a fixed SAMPLE_RATE_MS grid
+    next_sample = clock()
+    while True:
+        # Keep the receive queue empty so it never backs up the radio
+        while receive_into(rx_buf):
+            pass
+        
+        # One clock read serves the whole pass
+        now = clock()
+        fall_detected = analyze(now)
+        
+        if fall_detected:
+            send_fall_alert()
+        
+        pending(now)
+        
+        # Show status
+        if detector_state == STATE_IDLE and now >= display_hold_until:
+            show_icon(heart)
+        
+        # Stationary wearers would otherwise send the same value twice a second
+        if now >= next_data_send:
+            next_data_send = now + DATA_SEND_INTERVAL_MS
+            mag = get_magnitude()
+            if abs(mag - last_data_mag) > DATA_DELTA_MG or now - last_data_sent >= DATA_MAX_GAP_MS:
+                send_data(mag, now)
+                last_data_mag = mag
+                last_data_sent = now
+        
+        # After DATA, which pushes it back: only sent if no DATA went out lately
+        heartbeat(now)
+        
+        # Sleep until the next grid point
+        next_sample += SAMPLE_RATE_MS
+        delay = next_sample - clock()
+        if delay < 0:
+            # Overran: skip the missed points rather than sampling in a burst
+            next_sample -= delay - delay % SAMPLE_RATE_MS
+            delay %= SAMPLE_RATE_MS
+        if delay > 0:
+            sleep(delay)
+
+main()